@@ -130,6 +130,37 @@ else:
     }
 
 
+# Hachage des mots de passe : Argon2 en priorité, les anciens hachages PBKDF2
+# restent vérifiables et sont convertis à la prochaine connexion.
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/#using-argon2-with-django
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+]
+
+
+# -----------------
+# Cache (DEP agrégé, comptages de pagination)
+# -----------------
+# Redis si REDIS_URL est défini (partagé entre workers). Sans Redis, pas de
+# cache : une mémoire locale par worker servirait un DEP périmé aux workers
+# qui n'ont pas traité l'écriture.
+REDIS_URL = env("REDIS_URL", default=None)
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
@@ -171,18 +202,24 @@ if not DEBUG:
 # REST Framework, JWT, CORS, SPECTACULAR
 
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "users.pagination.CachedCountPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.FastJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "users.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=360),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    # Ajoute le claim "role" lu par users.permissions
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.RoleTokenObtainPairSerializer",
 }
 
 AUTH_USER_MODEL = "users.User"
@@ -1,9 +1,23 @@
 from django.contrib import admin
-from users.models import LaboProfile, MedecinProfile, PatientProfile, User
+from users.models import AuditLog, LaboProfile, MedecinProfile, PatientProfile, User
+
+
+class ChangeListOnlyMixin:
+    """Ne charge que les colonnes affichées dans la liste (change-list)."""
+
+    list_only_fields = ()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Le formulaire d'édition a besoin de toutes les colonnes.
+        match = request.resolver_match
+        if match and match.url_name and match.url_name.endswith("_changelist"):
+            queryset = queryset.only(*self.list_only_fields)
+        return queryset
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "userMail",
@@ -20,10 +34,23 @@ class UserAdmin(admin.ModelAdmin):
     list_filter = ("userRole", "userGender")
     search_fields = ("userMail", "userName", "userForName")
     ordering = ("-created_at",)
+    list_only_fields = (
+        "id",
+        "userMail",
+        "userName",
+        "userForName",
+        "userPhone",
+        "userDateOfBirth",
+        "userAddress",
+        "userRole",
+        "userGender",
+        "is_active",
+        "created_at",
+    )
 
 
 @admin.register(PatientProfile)
-class PatientProfileAdmin(admin.ModelAdmin):
+class PatientProfileAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "user__userName",
@@ -43,10 +70,23 @@ class PatientProfileAdmin(admin.ModelAdmin):
         "user__created_at",
         "user__is_active",
     )
+    list_select_related = ("user",)
+    list_only_fields = (
+        "id",
+        "user__userName",
+        "user__userForName",
+        "user__userMail",
+        "user__userGender",
+        "user__is_active",
+        "userGenotype",
+        "userBloodGroup",
+        "userDiseases",
+        "userAllergies",
+    )
 
 
 @admin.register(MedecinProfile)
-class MedecinProfileAdmin(admin.ModelAdmin):
+class MedecinProfileAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "user__userName",
@@ -60,10 +100,22 @@ class MedecinProfileAdmin(admin.ModelAdmin):
     )
     search_fields = ("user__userName", "user__userMail")
     list_filter = ("user__created_at", "user__is_active")
+    list_select_related = ("user",)
+    list_only_fields = (
+        "id",
+        "user__userName",
+        "user__userForName",
+        "user__userMail",
+        "user__userGender",
+        "user__userPhone",
+        "user__userDateOfBirth",
+        "user__userAddress",
+        "user__is_active",
+    )
 
 
 @admin.register(LaboProfile)
-class LaboProfileAdmin(admin.ModelAdmin):
+class LaboProfileAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "user__userName",
@@ -77,3 +129,29 @@ class LaboProfileAdmin(admin.ModelAdmin):
     )
     search_fields = ("user__userName", "user__userMail")
     list_filter = ("user__created_at", "user__is_active")
+    list_select_related = ("user",)
+    list_only_fields = (
+        "id",
+        "user__userName",
+        "user__userForName",
+        "user__userMail",
+        "user__userGender",
+        "user__userPhone",
+        "user__userDateOfBirth",
+        "user__userAddress",
+        "user__is_active",
+    )
+
+
+@admin.register(AuditLog)
+class AuditLogAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
+    list_display = ("timestamp", "user_email", "action", "ip_address")
+    list_select_related = ("user",)
+    list_per_page = 50
+    search_fields = ("action", "user__userMail")
+    list_only_fields = ("id", "timestamp", "action", "ip_address", "user__userMail")
+
+    @admin.display(ordering="user__userMail", description="Email")
+    def user_email(self, obj):
+        # user_id évite d'interroger la relation quand l'utilisateur est absent.
+        return obj.user.userMail if obj.user_id else "N/A"
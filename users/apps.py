@@ -3,3 +3,13 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        # Instancie les validateurs de mot de passe au démarrage : la liste
+        # gzip de CommonPasswordValidator n'est plus décodée à la 1re inscription.
+        from django.contrib.auth import password_validation
+
+        password_validation.get_default_password_validators()
+
+        # Enregistre l'extension drf-spectacular de l'authentification JWT.
+        import users.schema  # noqa: F401
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-15 09:12
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_alter_laboprofile_id_alter_medecinprofile_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('userMail'), name='uniq_usermail_ci'),
+        ),
+    ]
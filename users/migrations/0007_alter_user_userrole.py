@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-15 09:40
+
+from django.db import migrations, models
+
+
+ROLE_CODES = {
+    "Patient": 1,
+    "Médecin": 2,
+    "Admin": 3,
+    "Laboratoire": 4,
+}
+
+
+def roles_to_codes(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    for label, code in ROLE_CODES.items():
+        User.objects.filter(userRole=label).update(userRoleCode=code)
+
+
+def codes_to_roles(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    for label, code in ROLE_CODES.items():
+        User.objects.filter(userRoleCode=code).update(userRole=label)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_uniq_usermail_ci'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='userRoleCode',
+            field=models.PositiveSmallIntegerField(default=3),
+        ),
+        migrations.RunPython(roles_to_codes, codes_to_roles),
+        migrations.RemoveField(
+            model_name='user',
+            name='userRole',
+        ),
+        migrations.RenameField(
+            model_name='user',
+            old_name='userRoleCode',
+            new_name='userRole',
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='userRole',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Patient'), (2, 'Médecin'), (3, 'Admin'), (4, 'Laboratoire')], default=3),
+        ),
+    ]
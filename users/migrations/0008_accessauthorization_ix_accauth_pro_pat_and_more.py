@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_alter_user_userrole'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accessauthorization',
+            index=models.Index(fields=['professional', 'patient'], name='ix_accauth_pro_pat'),
+        ),
+        migrations.AddIndex(
+            model_name='accessauthorization',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['professional', 'patient'], name='ix_accauth_active'),
+        ),
+    ]
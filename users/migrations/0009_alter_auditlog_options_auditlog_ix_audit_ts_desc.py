@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_accessauthorization_ix_accauth_pro_pat_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='auditlog',
+            options={'ordering': ['-timestamp']},
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['-timestamp'], name='ix_audit_ts_desc'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:30
+
+from django.db import migrations, models
+from django.db.models.functions import Substr, Trim, Upper
+
+
+def trim_genders(apps, schema_editor):
+    # Ne garde que l'initiale ("M" / "F") avant de réduire la colonne.
+    User = apps.get_model("users", "User")
+    User.objects.update(userGender=Upper(Substr(Trim("userGender"), 1, 1)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_alter_auditlog_options_auditlog_ix_audit_ts_desc'),
+    ]
+
+    operations = [
+        migrations.RunPython(trim_genders, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='user',
+            name='userGender',
+            field=models.CharField(choices=[('M', 'Masculin'), ('F', 'Feminin')], max_length=1),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.CheckConstraint(condition=models.Q(('userGender__in', ['M', 'F'])), name='gender_valid'),
+        ),
+    ]
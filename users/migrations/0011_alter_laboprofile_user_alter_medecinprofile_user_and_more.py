@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-15 12:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_alter_user_usergender_user_gender_valid'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='laboprofile',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='labo_profile', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='medecinprofile',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='medecin_profile', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='patientprofile',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='patient_profile', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_alter_laboprofile_user_alter_medecinprofile_user_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='accessauthorization',
+            name='ix_accauth_active',
+        ),
+        migrations.AddIndex(
+            model_name='accessauthorization',
+            index=models.Index(fields=['patient', 'professional', 'is_active', 'expires_at'], name='ix_accauth_valid'),
+        ),
+    ]
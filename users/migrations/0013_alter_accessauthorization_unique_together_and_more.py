@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_remove_accessauthorization_ix_accauth_active_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='accessauthorization',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='accessauthorization',
+            constraint=models.UniqueConstraint(fields=('patient', 'professional'), name='uniq_patient_pro'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-15 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0013_alter_accessauthorization_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clinicalnote',
+            index=models.Index(fields=['patient', '-created_at'], name='ix_note_pat_created'),
+        ),
+        migrations.AddIndex(
+            model_name='prescription',
+            index=models.Index(fields=['patient', '-created_at'], name='ix_rx_pat_created'),
+        ),
+        migrations.AddIndex(
+            model_name='labtest',
+            index=models.Index(fields=['patient', '-created_at'], name='ix_labtest_pat_created'),
+        ),
+    ]
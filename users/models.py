@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -9,19 +11,14 @@ from django.utils import timezone
 
 class UserManager(BaseUserManager):
 
-    class TypeRole(models.TextChoices):
-        PATIENT = "Patient"
-        MEDECIN = "Médecin"
-        ADMIN = "Admin"
-        LABORATOIRE = "Laboratoire"
-
     def create_user(self, userMail, password=None, **extra_fields):
         if not userMail:
             raise ValueError("L'adresse Mail est obligatoire")
 
-        extra_fields.setdefault("userRole", self.TypeRole.PATIENT)
+        extra_fields.setdefault("userRole", self.model.TypeRole.PATIENT)
 
-        user = self.model(userMail=self.normalize_email(userMail), **extra_fields)
+        # Email entièrement en minuscules (partie locale comprise).
+        user = self.model(userMail=userMail.strip().lower(), **extra_fields)
         user.set_password(password)
         user.save(using=self._db)
 
@@ -29,20 +26,60 @@ class UserManager(BaseUserManager):
 
     def create_superuser(self, userMail, password=None, **extra_fields):
 
-        extra_fields.setdefault("userRole", self.TypeRole.ADMIN)
+        extra_fields.setdefault("userRole", self.model.TypeRole.ADMIN)
         extra_fields.setdefault("is_staff", True)
         extra_fields.setdefault("is_superuser", True)
 
         return self.create_user(userMail, password, **extra_fields)
 
 
+class SelectRelatedManager(models.Manager):
+    """Manager par défaut qui joint les utilisateurs liés (évite le N+1 sur __str__)."""
+
+    related_fields = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.related_fields:
+            queryset = queryset.select_related(*self.related_fields)
+        return queryset
+
+
+class ProfileManager(SelectRelatedManager):
+    related_fields = ("user",)
+
+
+class AccessAuthorizationQuerySet(models.QuerySet):
+    def valid(self):
+        """Autorisations actives et non expirées (sans date d'expiration : illimitées)."""
+        return self.filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now()), is_active=True
+        )
+
+
+class AccessAuthorizationManager(SelectRelatedManager.from_queryset(AccessAuthorizationQuerySet)):
+    related_fields = ("patient", "professional")
+
+
+class ClinicalRecordManager(SelectRelatedManager):
+    related_fields = ("patient", "doctor")
+
+
+class LabTestManager(SelectRelatedManager):
+    related_fields = ("patient", "prescribed_by", "performed_by", "interpreted_by")
+
+
+class AuditLogManager(SelectRelatedManager):
+    related_fields = ("user",)
+
+
 class User(AbstractBaseUser, PermissionsMixin):
 
-    class TypeRole(models.TextChoices):
-        PATIENT = "Patient"
-        MEDECIN = "Médecin"
-        ADMIN = "Admin"
-        LABORATOIRE = "Laboratoire"
+    class TypeRole(models.IntegerChoices):
+        PATIENT = 1, "Patient"
+        MEDECIN = 2, "Médecin"
+        ADMIN = 3, "Admin"
+        LABORATOIRE = 4, "Laboratoire"
 
     class TypeGender(models.TextChoices):
         MASCULIN = "M"
@@ -54,11 +91,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     userPhone = models.CharField(max_length=9, null=True, blank=True)
     userDateOfBirth = models.DateField(blank=True, null=True)
     userGender = models.CharField(
-        max_length=10, choices=TypeGender.choices, blank=False, null=False
+        max_length=1, choices=TypeGender.choices, blank=False, null=False
     )
     userAddress = models.TextField(null=True, blank=True)
-    userRole = models.CharField(
-        max_length=20, choices=TypeRole.choices, default=TypeRole.ADMIN
+    userRole = models.PositiveSmallIntegerField(
+        choices=TypeRole.choices, default=TypeRole.ADMIN
     )
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
@@ -77,16 +114,27 @@ class User(AbstractBaseUser, PermissionsMixin):
         "userAddress",
     ]
 
+    class Meta:
+        constraints = [
+            # Unicité insensible à la casse, vérifiée par un seul index.
+            models.UniqueConstraint(Lower("userMail"), name="uniq_usermail_ci"),
+            models.CheckConstraint(
+                condition=Q(userGender__in=["M", "F"]), name="gender_valid"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.userName} ({self.userMail})"
 
 
 class MedecinProfile(models.Model):
-    user = models.ForeignKey(
+    user = models.OneToOneField(
         "users.User", on_delete=models.CASCADE, related_name="medecin_profile"
     )
     hospital = models.CharField(max_length=50, blank=False, null=True)
 
+    objects = ProfileManager()
+
     def __str__(self):
         return f"MedecinProfile de {self.user.userName}"
 
@@ -110,7 +158,7 @@ class PatientProfile(models.Model):
         O_POS = "O+"
         O_NEG = "O-"
 
-    user = models.ForeignKey(
+    user = models.OneToOneField(
         "users.User", on_delete=models.CASCADE, related_name="patient_profile"
     )
     userAllergies = models.TextField(blank=True, null=True)
@@ -125,15 +173,19 @@ class PatientProfile(models.Model):
         max_length=5, choices=TypeBloodGroup.choices, null=False, blank=False
     )
 
+    objects = ProfileManager()
+
     def __str__(self):
         return f"PatientProfile de {self.user.userName}"
 
 
 class LaboProfile(models.Model):
-    user = models.ForeignKey(
+    user = models.OneToOneField(
         "users.User", on_delete=models.CASCADE, related_name="labo_profile"
     )
 
+    objects = ProfileManager()
+
     def __str__(self):
         return f"LaboProfile de {self.user.userName}"
 
@@ -153,19 +205,31 @@ class AccessAuthorization(models.Model):
     # Peut être utilisé pour les accès d'urgence (PAT-6)
     is_emergency = models.BooleanField(default=False) 
 
+    objects = AccessAuthorizationManager()
+
     class Meta:
-        unique_together = ('patient', 'professional')
+        constraints = [
+            # Cible du ON CONFLICT de grant_access.
+            models.UniqueConstraint(fields=['patient', 'professional'], name='uniq_patient_pro'),
+        ]
+        indexes = [
+            models.Index(fields=['professional', 'patient'], name='ix_accauth_pro_pat'),
+            # Couvre has_active_access : la vérification se fait sur l'index seul.
+            models.Index(
+                fields=['patient', 'professional', 'is_active', 'expires_at'],
+                name='ix_accauth_valid',
+            ),
+        ]
 
     def __str__(self):
         return f"Accès de {self.professional.userName} au DEP de {self.patient.userName}"
 
-    def is_valid(self):
-        """Vérifie si l'autorisation est active et non expirée."""
-        if not self.is_active:
-            return False
-        if self.expires_at and self.expires_at < timezone.now():
-            return False
-        return True
+    @classmethod
+    def has_active_access(cls, patient_id, professional_id):
+        """Vérifie, en une seule requête, qu'une autorisation active et non expirée existe."""
+        return cls.objects.valid().filter(
+            patient_id=patient_id, professional_id=professional_id
+        ).exists()
 
 
 # Modèle pour les Notes Cliniques / Consultations (DOC-4)
@@ -186,6 +250,12 @@ class ClinicalNote(models.Model):
 
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = ClinicalRecordManager()
+
+    class Meta:
+        # DEP d'un patient, du plus récent au plus ancien : pas de tri à l'exécution.
+        indexes = [models.Index(fields=['patient', '-created_at'], name='ix_note_pat_created')]
+
     def __str__(self):
         return f"Note clinique pour {self.patient.userName} par Dr. {self.doctor.userName} le {self.created_at.strftime('%Y-%m-%d')}"
 
@@ -203,6 +273,11 @@ class Prescription(models.Model):
     pdf_document = models.FileField(upload_to='prescriptions/', null=True, blank=True) 
     
     created_at = models.DateTimeField(default=timezone.now)
+
+    objects = ClinicalRecordManager()
+
+    class Meta:
+        indexes = [models.Index(fields=['patient', '-created_at'], name='ix_rx_pat_created')]
     
     def __str__(self):
         return f"Ordonnance #{self.id} pour {self.patient.userName}"
@@ -248,6 +323,11 @@ class LabTest(models.Model):
     
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = LabTestManager()
+
+    class Meta:
+        indexes = [models.Index(fields=['patient', '-created_at'], name='ix_labtest_pat_created')]
+
     def __str__(self):
         return f"{self.test_name} - Statut: {self.status} pour {self.patient.userName}"
 
@@ -262,5 +342,12 @@ class AuditLog(models.Model):
     details = models.TextField(null=True, blank=True)
     timestamp = models.DateTimeField(default=timezone.now)
 
+    objects = AuditLogManager()
+
+    class Meta:
+        ordering = ['-timestamp']
+        # Correspond à ORDER BY timestamp DESC LIMIT N (liste des journaux).
+        indexes = [models.Index(fields=['-timestamp'], name='ix_audit_ts_desc')]
+
     def __str__(self):
         return f"[{self.timestamp.strftime('%Y-%m-%d %H:%M')}] {self.user.userMail if self.user else 'N/A'} - {self.action}"
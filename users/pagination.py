@@ -0,0 +1,53 @@
+# users/pagination.py
+
+import hashlib
+
+from django.core.cache import cache
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class CachedCountPagination(LimitOffsetPagination):
+    """LimitOffsetPagination dont le COUNT(*) est mis en cache entre les pages.
+
+    Le total est recalculé sur la première page (offset 0) puis réutilisé,
+    pendant count_cache_timeout secondes, pour les pages suivantes de la même
+    liste (même vue, même action, même utilisateur, mêmes filtres).
+    """
+
+    count_cache_timeout = 300
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        key = self.get_count_cache_key()
+        if self.get_offset(self.request) > 0:
+            count = cache.get(key)
+            if count is not None:
+                return count
+        count = super().get_count(queryset)
+        cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    def get_count_cache_key(self):
+        params = sorted(
+            (name, value)
+            for name, value in self.request.query_params.lists()
+            if name not in (self.limit_query_param, self.offset_query_param)
+        )
+        digest = hashlib.md5(repr(params).encode(), usedforsecurity=False).hexdigest()
+        return ":".join((
+            "count",
+            type(self.view).__name__,
+            str(getattr(self.view, "action", "")),
+            str(self.request.user.pk),
+            digest,
+        ))
+
+
+class AuditLogPagination(CursorPagination):
+    """Pagination par curseur du journal d'audit : pas de COUNT ni d'OFFSET."""
+
+    page_size = 50
+    ordering = "-timestamp"
@@ -2,17 +2,25 @@
 
 from rest_framework import permissions
 
+from users.models import User
+
+def get_role(request):
+    """Rôle lu dans le jeton JWT ; à défaut (ancien jeton), celui de l'utilisateur."""
+    token = request.auth
+    role = token.get('role') if token is not None else None
+    return request.user.userRole if role is None else role
+
 class IsPatient(permissions.BasePermission):
     """Autorise uniquement l'accès si l'utilisateur est un patient."""
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.userRole == 'Patient'
+        return request.user.is_authenticated and get_role(request) == User.TypeRole.PATIENT
 
 class IsDoctor(permissions.BasePermission):
     """Autorise uniquement l'accès si l'utilisateur est un médecin."""
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.userRole == 'Médecin'
+        return request.user.is_authenticated and get_role(request) == User.TypeRole.MEDECIN
 
 class IsLabo(permissions.BasePermission):
     """Autorise uniquement l'accès si l'utilisateur est un laboratoire."""
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.userRole == 'Laboratoire'
\ No newline at end of file
+        return request.user.is_authenticated and get_role(request) == User.TypeRole.LABORATOIRE
\ No newline at end of file
@@ -0,0 +1,27 @@
+# users/renderers.py
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Types que orjson ne connaît pas (Decimal, chaînes traduites, UUID...) : même
+# conversion que l'encodeur de DRF.
+_fallback = JSONEncoder().default
+
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data, indent=False):
+    """Encode en JSON (bytes, UTF-8, compact) avec orjson."""
+    option = _OPTIONS | orjson.OPT_INDENT_2 if indent else _OPTIONS
+    return orjson.dumps(data, default=_fallback, option=option)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer de DRF dont l'encodage est délégué à orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return dumps(data, indent=bool(indent))
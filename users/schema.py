@@ -0,0 +1,9 @@
+# users/schema.py
+
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class FastJWTScheme(SimpleJWTScheme):
+    """Documente FastJWTAuthentication comme le schéma JWT de SimpleJWT."""
+
+    target_class = "users.authentication.FastJWTAuthentication"
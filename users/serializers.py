@@ -1,15 +1,50 @@
-from cProfile import label
-import attr
 from rest_framework.serializers import (
     ModelSerializer,
     CharField,
     Serializer,
     ChoiceField,
+    IntegerField,
+    DateTimeField,
+    FileField,
+    IPAddressField,
 )
 from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.password_validation import validate_password
-from django.db import models
-from users.models import User, PatientProfile, MedecinProfile, LaboProfile, AuditLog , ClinicalNote, Prescription, LabTest, AccessAuthorization
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from users.models import User, PatientProfile, MedecinProfile, LaboProfile, ClinicalNote, Prescription, LabTest, AccessAuthorization
+
+# Valeurs autorisées, calculées une seule fois au chargement du module.
+_VALID_ROLES = frozenset(User.TypeRole.values)
+_VALID_GENDERS = frozenset(User.TypeGender.values)
+
+
+def _is_email_conflict(error):
+    """Vrai si l'IntegrityError vient de l'unicité de l'email (exacte ou insensible à la casse)."""
+    message = str(error)
+    return "uniq_usermail_ci" in message or "userMail" in message
+
+
+def _iso_datetime(value):
+    """Même rendu que DateTimeField de DRF (ISO 8601, suffixe Z en UTC)."""
+    if value is None:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def _file_url(file, context):
+    """Même rendu que FileField de DRF (URL absolue si la requête est connue)."""
+    if not file:
+        return None
+    request = context.get("request")
+    if request is not None:
+        return request.build_absolute_uri(file.url)
+    return file.url
 
 
 class UserSerializer(ModelSerializer):
@@ -31,6 +66,34 @@ class UserSerializer(ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
+def serialize_user(user):
+    """Même rendu que UserSerializer(user).data, sans instancier le sérialiseur."""
+    birth_date = user.userDateOfBirth
+    return {
+        "id": user.id,
+        "userMail": user.userMail,
+        "userName": user.userName,
+        "userForName": user.userForName,
+        "userPhone": user.userPhone,
+        "userDateOfBirth": birth_date.isoformat() if birth_date else None,
+        "userGender": user.userGender,
+        "userAddress": user.userAddress,
+        "userRole": user.userRole,
+        "created_at": _iso_datetime(user.created_at),
+        "updated_at": _iso_datetime(user.updated_at),
+    }
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Connexion (AUTH-1) : le rôle est ajouté au jeton pour les permissions."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["role"] = user.userRole
+        return token
+
+
 class UserRegisterSerializer(ModelSerializer):
     password = CharField(write_only=True, required=True)
     password2 = CharField(write_only=True, required=True, label="Confirm password")
@@ -49,6 +112,8 @@ class UserRegisterSerializer(ModelSerializer):
             "password",
             "password2",
         ]
+        # L'unicité de l'email est garantie par la contrainte en base (voir create_user).
+        extra_kwargs = {"userMail": {"validators": []}}
 
     def validate(self, attrs):
         if attrs["password"] != attrs["password2"]:
@@ -58,34 +123,35 @@ class UserRegisterSerializer(ModelSerializer):
         validate_password(attrs["password"])
 
         userRole = attrs.get("userRole")
-        valid_roles = [choice[0] for choice in User.TypeRole.choices]
-        if userRole not in valid_roles:
+        if userRole not in _VALID_ROLES:
             raise ValidationError({"userRole": "Rôle invalide"})
         if userRole == User.TypeRole.ADMIN:
             raise ValidationError(
                 {"userRole": "L'inscription en tant qu'admin n'est pas autorisée."}
             )
 
-        userMail = attrs.get("userMail")
-        if User.objects.filter(userMail__iexact=userMail).exists():
-            raise ValidationError({"userMail": "Cet email est déjà utilisé."})
-
         userGender = attrs.get("userGender")
-        valid_genders = [choice[0] for choice in User.TypeGender.choices]
-        if userGender not in valid_genders:
+        if userGender not in _VALID_GENDERS:
             raise ValidationError({"userGender": "Genre invalide"})
 
         return attrs
 
+    def create_user(self, password, **extra_fields):
+        # Un doublon d'email est rejeté par la base, sans requête préalable.
+        try:
+            return User.objects.create_user(password=password, **extra_fields)
+        except IntegrityError as error:
+            if not _is_email_conflict(error):
+                raise
+            raise ValidationError({"userMail": "Cet email est déjà utilisé."})
+
     def create(self, validated_data):
-        validated_data["userMail"] = validated_data["userMail"].lower()
-        
         # *** CORRECTION CRITIQUE 1/4 ***
         # Utiliser create_user pour hacher correctement le mot de passe
         password = validated_data.pop("password")
         validated_data.pop("password2")
         
-        user = User.objects.create_user(
+        user = self.create_user(
             password=password, 
             **validated_data
         )
@@ -97,7 +163,35 @@ class UserRegisterSerializer(ModelSerializer):
 class UserUpdateSerializer(ModelSerializer):
     class Meta:
         model = User
-        exclude = ["password"]
+        # Liste explicite (tous les champs sauf le mot de passe).
+        fields = [
+            "id",
+            "userMail",
+            "userName",
+            "userForName",
+            "userPhone",
+            "userDateOfBirth",
+            "userGender",
+            "userAddress",
+            "userRole",
+            "created_at",
+            "updated_at",
+            "last_login",
+            "is_active",
+            "is_staff",
+            "is_superuser",
+            "groups",
+            "user_permissions",
+        ]
+
+    def validate_userMail(self, value):
+        # La contrainte uniq_usermail_ci (Lower) n'est pas vérifiée par DRF.
+        others = User.objects.filter(userMail__iexact=value)
+        if self.instance is not None:
+            others = others.exclude(pk=self.instance.pk)
+        if others.exists():
+            raise ValidationError("Cet email est déjà utilisé.")
+        return value
 
 
 class ChangePasswordSerializer(Serializer):
@@ -130,6 +224,8 @@ class PatientRegisterSerializer(UserRegisterSerializer):
         attrs["userRole"] = User.TypeRole.PATIENT
         return super().validate(attrs)
 
+    # Utilisateur et profil sont validés dans un seul COMMIT.
+    @transaction.atomic(savepoint=False)
     def create(self, validated_data):
         # 1. Extraire les champs spécifiques au profil
         blood_group = validated_data.pop("userBloodGroup")
@@ -138,13 +234,12 @@ class PatientRegisterSerializer(UserRegisterSerializer):
         allergies = validated_data.pop("userAllergies", None)
         
         # 2. Extraire et préparer les données d'utilisateur
-        validated_data["userMail"] = validated_data["userMail"].lower()
         password = validated_data.pop("password")
         validated_data.pop("password2")
         
         # *** CORRECTION CRITIQUE 2/4 ***
         # Création de l'utilisateur de base (hachage du mot de passe inclus)
-        user = User.objects.create_user(password=password, **validated_data)
+        user = self.create_user(password=password, **validated_data)
         # Fin de la correction
         
         # 3. Création du profil patient
@@ -165,16 +260,16 @@ class LaboRegisterSerializer(UserRegisterSerializer):
         attrs["userRole"] = User.TypeRole.LABORATOIRE
         return super().validate(attrs)
 
+    @transaction.atomic(savepoint=False)
     def create(self, validated_data):
         
         # 1. Extraire et préparer les données d'utilisateur
-        validated_data["userMail"] = validated_data["userMail"].lower()
         password = validated_data.pop("password")
         validated_data.pop("password2")
 
         # *** CORRECTION CRITIQUE 3/4 ***
         # Création de l'utilisateur de base (hachage du mot de passe inclus)
-        user = User.objects.create_user(password=password, **validated_data)
+        user = self.create_user(password=password, **validated_data)
         # Fin de la correction
         
         # 2. Création du profil spécifique
@@ -193,18 +288,18 @@ class MedecinRegisterSerializer(UserRegisterSerializer):
         attrs["userRole"] = User.TypeRole.MEDECIN
         return super().validate(attrs)
 
+    @transaction.atomic(savepoint=False)
     def create(self, validated_data):
         # 1. Extraire les champs spécifiques au profil
         hospital = validated_data.pop("hospital", None)
 
         # 2. Extraire et préparer les données d'utilisateur
-        validated_data["userMail"] = validated_data["userMail"].lower()
         password = validated_data.pop("password")
         validated_data.pop("password2")
 
         # *** CORRECTION CRITIQUE 4/4 ***
         # Création de l'utilisateur de base (hachage du mot de passe inclus)
-        user = User.objects.create_user(password=password, **validated_data)
+        user = self.create_user(password=password, **validated_data)
         # Fin de la correction
 
         # 3. Création du profil spécifique
@@ -228,7 +323,7 @@ class AccessAuthorizationSerializer(ModelSerializer):
 # Sérialiseur pour créer une demande d'accès
 class CreateAccessRequestSerializer(Serializer):
     professional_email = CharField(required=True)
-    expiration_days = models.IntegerField(default=7) # Durée de l'accès
+    expiration_days = IntegerField(default=7, min_value=1, max_value=365) # Durée de l'accès (en jours)
 
 # Sérialiseur pour les Notes Cliniques (DOC-4)
 class ClinicalNoteSerializer(ModelSerializer):
@@ -248,20 +343,54 @@ class PrescriptionSerializer(ModelSerializer):
         fields = '__all__'
         read_only_fields = ['id', 'patient', 'doctor', 'created_at', 'pdf_document', 'doctor_name']
 
+# Représentation d'un examen, partagée par le sérialiseur de lecture et ceux
+# d'écriture : to_representation construit le dict directement (pas de copie
+# ni de parcours des champs DRF).
+class LabTestRepresentationMixin:
+    def to_representation(self, instance):
+        return {
+            'id': instance.id,
+            'patient_name': instance.patient.userName,
+            'prescribed_by_name': instance.prescribed_by.userName if instance.prescribed_by_id else None,
+            'performed_by_name': instance.performed_by.userName if instance.performed_by_id else None,
+            'interpreted_by_name': instance.interpreted_by.userName if instance.interpreted_by_id else None,
+            'test_name': instance.test_name,
+            'details': instance.details,
+            'status': instance.status,
+            'result_document': _file_url(instance.result_document, self.context),
+            'result_uploaded_at': _iso_datetime(instance.result_uploaded_at),
+            'doctor_interpretation': instance.doctor_interpretation,
+            'created_at': _iso_datetime(instance.created_at),
+            'patient': instance.patient_id,
+            'prescribed_by': instance.prescribed_by_id,
+            'performed_by': instance.performed_by_id,
+            'interpreted_by': instance.interpreted_by_id,
+        }
+
+
 # Sérialiseur pour les Examens de Laboratoire (LAB-1, LAB-3)
-class LabTestSerializer(ModelSerializer):
+# Lecture seule : les champs déclarés servent au schéma.
+class LabTestSerializer(LabTestRepresentationMixin, Serializer):
+    id = IntegerField(read_only=True)
     patient_name = CharField(source='patient.userName', read_only=True)
     prescribed_by_name = CharField(source='prescribed_by.userName', read_only=True)
     performed_by_name = CharField(source='performed_by.userName', read_only=True)
     interpreted_by_name = CharField(source='interpreted_by.userName', read_only=True)
-    
-    class Meta:
-        model = LabTest
-        fields = '__all__'
-        read_only_fields = ['id', 'patient', 'created_at', 'result_uploaded_at', 'patient_name', 'prescribed_by_name', 'performed_by_name', 'interpreted_by_name']
-        
+    test_name = CharField(read_only=True)
+    details = CharField(read_only=True)
+    status = ChoiceField(choices=LabTest.TestStatus.choices, read_only=True)
+    result_document = FileField(read_only=True)
+    result_uploaded_at = DateTimeField(read_only=True)
+    doctor_interpretation = CharField(read_only=True)
+    created_at = DateTimeField(read_only=True)
+    patient = IntegerField(read_only=True)
+    prescribed_by = IntegerField(read_only=True)
+    performed_by = IntegerField(read_only=True)
+    interpreted_by = IntegerField(read_only=True)
+
+
 # Sérialiseur d'upload de résultat (LAB-3)
-class LabTestResultUploadSerializer(ModelSerializer):
+class LabTestResultUploadSerializer(LabTestRepresentationMixin, ModelSerializer):
     class Meta:
         model = LabTest
         fields = ['result_document', 'status']
@@ -271,17 +400,55 @@ class LabTestResultUploadSerializer(ModelSerializer):
             raise ValidationError("Le document de résultat est obligatoire.")
         return value
 
+# Sérialiseur de changement de statut (LAB-2) : les choix sont validés par le ChoiceField
+class LabTestStatusSerializer(Serializer):
+    status = ChoiceField(
+        choices=LabTest.TestStatus.choices,
+        error_messages={'invalid_choice': "Statut invalide."},
+    )
+
 # Sérialiseur d'Interprétation (DOC-6)
-class LabTestInterpretationSerializer(ModelSerializer):
+class LabTestInterpretationSerializer(LabTestRepresentationMixin, ModelSerializer):
     class Meta:
         model = LabTest
         fields = ['doctor_interpretation']
 
-# Sérialiseur de Log d'Audit (ADM-5)
-class AuditLogSerializer(ModelSerializer):
+# Sérialiseur de Log d'Audit (ADM-5), en lecture seule comme LabTestSerializer
+class AuditLogSerializer(Serializer):
+    id = IntegerField(read_only=True)
     user_email = CharField(source='user.userMail', read_only=True)
-    
-    class Meta:
-        model = AuditLog
-        fields = '__all__'
-        read_only_fields = ['id', 'user', 'timestamp', 'ip_address']
+    action = CharField(read_only=True)
+    ip_address = IPAddressField(read_only=True)
+    details = CharField(read_only=True)
+    timestamp = DateTimeField(read_only=True)
+    user = IntegerField(read_only=True)
+
+    @staticmethod
+    def rows(queryset):
+        """Lignes .values() lues par to_representation, sans instance AuditLog ni User."""
+        return queryset.values(
+            'id', 'action', 'ip_address', 'details', 'timestamp', 'user_id',
+            user_email=F('user__userMail'),
+        )
+
+    def to_representation(self, instance):
+        # Accepte aussi les lignes de rows() (avec user_email annoté).
+        if isinstance(instance, dict):
+            return {
+                'id': instance['id'],
+                'user_email': instance['user_email'],
+                'action': instance['action'],
+                'ip_address': instance['ip_address'],
+                'details': instance['details'],
+                'timestamp': _iso_datetime(instance['timestamp']),
+                'user': instance['user_id'],
+            }
+        return {
+            'id': instance.id,
+            'user_email': instance.user.userMail if instance.user_id else None,
+            'action': instance.action,
+            'ip_address': instance.ip_address,
+            'details': instance.details,
+            'timestamp': _iso_datetime(instance.timestamp),
+            'user': instance.user_id,
+        }
@@ -1,3 +1,186 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import AccessAuthorization, ClinicalNote, LabTest, Prescription, User
+
+
+def _user(mail, role):
+    return User.objects.create_user(
+        mail, password=None, userName=mail.split("@")[0], userForName="Test",
+        userGender=User.TypeGender.FEMININ, userRole=role,
+    )
+
+
+# Nombre de requêtes SQL des endpoints du DEP : verrouille les optimisations
+# (jointures, cache) contre un retour du N+1 quand les sérialiseurs évoluent.
+# Cache local explicite : sans REDIS_URL, les settings désactivent le cache.
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class DEPQueryCountTests(TestCase):
+    RECORDS = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.patient = _user("patient@test.cm", User.TypeRole.PATIENT)
+        cls.doctor = _user("medecin@test.cm", User.TypeRole.MEDECIN)
+        cls.labo = _user("labo@test.cm", User.TypeRole.LABORATOIRE)
+
+        for index in range(cls.RECORDS):
+            ClinicalNote.objects.create(patient=cls.patient, doctor=cls.doctor, observation=f"Note {index}")
+            Prescription.objects.create(patient=cls.patient, doctor=cls.doctor, medication_details=f"Ordonnance {index}")
+            LabTest.objects.create(
+                patient=cls.patient, prescribed_by=cls.doctor, performed_by=cls.labo,
+                interpreted_by=cls.doctor, test_name=f"Examen {index}",
+                status=LabTest.TestStatus.COMPLETED,
+            )
+
+        AccessAuthorization.objects.create(
+            patient=cls.patient, professional=cls.doctor,
+            expires_at=timezone.now() + timedelta(days=7),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_consult_dep(self):
+        self.client.force_authenticate(self.patient)
+
+        # Notes, ordonnances, examens : une requête chacun, auteurs joints.
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/dep/patient/consult/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["lab_results"]), self.RECORDS)
+
+        # DEP servi depuis le cache.
+        with self.assertNumQueries(0):
+            self.client.get("/api/dep/patient/consult/")
+
+    def test_check_access_and_consult(self):
+        self.client.force_authenticate(self.doctor)
+        url = f"/api/dep/access/check/?patient_id={self.patient.pk}"
+
+        # Patient et autorisation en une requête, puis les trois listes du DEP.
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["patient_name"], self.patient.userName)
+        self.assertEqual(len(response.data["clinical_notes"]), self.RECORDS)
+
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+    def test_write_invalidates_cached_dep(self):
+        self.client.force_authenticate(self.patient)
+        self.client.get("/api/dep/patient/consult/")
+
+        self.client.force_authenticate(self.doctor)
+        response = self.client.post(
+            "/api/dep/doctor/add-note/",
+            {"patient": self.patient.pk, "observation": "Nouvelle note"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+        self.client.force_authenticate(self.patient)
+        response = self.client.get("/api/dep/patient/consult/")
+        self.assertEqual(len(response.data["clinical_notes"]), self.RECORDS + 1)
+
+    def test_bulk_add_notes(self):
+        self.client.force_authenticate(self.doctor)
+        payload = [
+            {"patient": self.patient.pk, "observation": f"Note groupée {index}"}
+            for index in range(3)
+        ]
+
+        # Patients, autorisations, puis un seul INSERT pour toute la liste.
+        with self.assertNumQueries(3):
+            response = self.client.post("/api/dep/doctor/add-note/", payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["ids"]), 3)
+        self.assertEqual(ClinicalNote.objects.filter(patient=self.patient).count(), self.RECORDS + 3)
+
+    def test_bulk_add_notes_refused_for_one_patient(self):
+        other = _user("autre@test.cm", User.TypeRole.PATIENT)
+        self.client.force_authenticate(self.doctor)
+        url = "/api/dep/doctor/add-note/"
+
+        # Un patient sans autorisation : toute la liste est refusée.
+        response = self.client.post(url, [
+            {"patient": self.patient.pk, "observation": "A"},
+            {"patient": other.pk, "observation": "B"},
+        ], format="json")
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.post(url, [
+            {"patient": self.patient.pk, "observation": "A"},
+            {"patient": self.labo.pk, "observation": "B"},
+        ], format="json")
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.post(url, [{"observation": "A"}], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"patient": "Le champ patient est requis."})
+
+        self.assertEqual(ClinicalNote.objects.filter(patient__in=[self.patient, other]).count(), self.RECORDS)
+
+    def test_consult_dep_with_jwt(self):
+        patient = _user("jwt@test.cm", User.TypeRole.PATIENT)
+        patient.set_password("Motdepasse-123")
+        patient.save(update_fields=["password"])
+        ClinicalNote.objects.create(patient=patient, doctor=self.doctor, observation="Note")
+
+        response = self.client.post(
+            "/api/login/", {"userMail": "jwt@test.cm", "password": "Motdepasse-123"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+        # Utilisateur du jeton (colonnes réduites), puis les trois listes du DEP.
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/dep/patient/consult/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["clinical_notes"]), 1)
+
+
+class LabTestSetStatusTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.patient = _user("patient@test.cm", User.TypeRole.PATIENT)
+        cls.labo = _user("labo@test.cm", User.TypeRole.LABORATOIRE)
+        cls.other_labo = _user("autre-labo@test.cm", User.TypeRole.LABORATOIRE)
+        cls.lab_test = LabTest.objects.create(patient=cls.patient, performed_by=cls.labo, test_name="NFS")
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _set_status(self, user, pk, status=LabTest.TestStatus.IN_PROGRESS):
+        self.client.force_authenticate(user)
+        return self.client.patch(
+            f"/api/dep/labo/examens/{pk}/set-status/", {"status": status}, format="json"
+        )
+
+    def test_set_status(self):
+        response = self._set_status(self.labo, self.lab_test.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], LabTest.TestStatus.IN_PROGRESS)
+        self.assertEqual(response.data["performed_by_name"], self.labo.userName)
+        self.lab_test.refresh_from_db()
+        self.assertEqual(self.lab_test.status, LabTest.TestStatus.IN_PROGRESS)
+
+    def test_set_status_unknown_test(self):
+        response = self._set_status(self.labo, 99999)
+        self.assertEqual(response.status_code, 404)
+
+    def test_set_status_other_labo(self):
+        response = self._set_status(self.other_labo, self.lab_test.pk)
+        self.assertEqual(response.status_code, 403)
+        self.lab_test.refresh_from_db()
+        self.assertEqual(self.lab_test.status, LabTest.TestStatus.PENDING)
+
+    def test_set_status_invalid(self):
+        response = self._set_status(self.labo, self.lab_test.pk, status="Inconnu")
+        self.assertEqual(response.status_code, 400)
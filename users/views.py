@@ -1,5 +1,6 @@
 # users/views.py
 
+from rest_framework.mixins import ListModelMixin
 from rest_framework.viewsets import ModelViewSet, GenericViewSet
 from rest_framework.status import (
     HTTP_201_CREATED, 
@@ -9,14 +10,20 @@ from rest_framework.status import (
     HTTP_404_NOT_FOUND
 )
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.parsers import FileUploadParser # Importation pour l'upload de fichiers
+from rest_framework.renderers import JSONRenderer
 
+from django.core.cache import cache # Cache du DEP agrégé
 from django.db.models import Q # Importation pour les requêtes complexes
+import time
+from functools import lru_cache
 from datetime import timedelta # Importation pour la gestion de l'expiration
 from django.utils import timezone # Importation pour la gestion des dates/heures
 from django.shortcuts import get_object_or_404 # Importation pour les objets non trouvés
+from django.http import Http404, StreamingHttpResponse
 
 from users.models import (
     ClinicalNote, Prescription, LabTest, AccessAuthorization, User, AuditLog
@@ -24,20 +31,172 @@ from users.models import (
 from users.serializers import (
     ClinicalNoteSerializer, PrescriptionSerializer, LabTestSerializer, 
     AccessAuthorizationSerializer, LabTestResultUploadSerializer, LabTestInterpretationSerializer, 
+    LabTestStatusSerializer,
     CreateAccessRequestSerializer, AuditLogSerializer,
     LaboRegisterSerializer,
     MedecinRegisterSerializer,
     PatientRegisterSerializer,
     UserSerializer,
+    serialize_user,
     UserRegisterSerializer,
     UserUpdateSerializer,
     ChangePasswordSerializer,
 )
 from users.permissions import IsPatient, IsDoctor, IsLabo # Importation des permissions personnalisées
+from users.pagination import AuditLogPagination
+from users.renderers import dumps
 
 from drf_spectacular.utils import extend_schema
 
 
+# Rôles des professionnels de santé (médecins et laboratoires).
+_PRO_ROLES = frozenset({User.TypeRole.MEDECIN, User.TypeRole.LABORATOIRE})
+_PRO_Q = Q(userRole__in=sorted(_PRO_ROLES))
+
+# Relations lues par les champs *_name des sérialiseurs.
+_LAB_TEST_USERS = ('patient', 'prescribed_by', 'performed_by', 'interpreted_by')
+
+
+@lru_cache(maxsize=None)
+def _expiration_delta(days):
+    """Durée d'un accès ; au plus 365 valeurs possibles (CreateAccessRequestSerializer)."""
+    return timedelta(days=days)
+
+
+def _lab_editable(labo):
+    """Examens visibles et modifiables par un labo."""
+    return (
+        Q(performed_by=labo) # Si le labo est explicitement désigné
+        | Q(performed_by__isnull=True) # Pour les cas où le labo peut prendre n'importe quel test
+    )
+
+
+def _with_user_names(queryset, *relations):
+    """Joint les utilisateurs liés en ne chargeant que leur nom (userName)."""
+    own_fields = [field.name for field in queryset.model._meta.concrete_fields]
+    return queryset.select_related(None).select_related(*relations).only(
+        *own_fields, *(f"{relation}__userName" for relation in relations)
+    )
+
+
+def _dep_querysets(patient_id):
+    """Notes, ordonnances et examens du DEP d'un patient, avec les noms des auteurs joints."""
+    return (
+        _with_user_names(ClinicalNote.objects.filter(patient_id=patient_id), 'doctor').order_by('-created_at'),
+        _with_user_names(Prescription.objects.filter(patient_id=patient_id), 'doctor').order_by('-created_at'),
+        _with_user_names(LabTest.objects.filter(patient_id=patient_id), *_LAB_TEST_USERS).order_by('-created_at'),
+    )
+
+
+def _build_dep(patient_id):
+    """DEP agrégé d'un patient, sérialisé (PAT-1, DOC-3)."""
+    notes, prescriptions, lab_tests = _dep_querysets(patient_id)
+    return {
+        'clinical_notes': ClinicalNoteSerializer(notes, many=True).data,
+        'prescriptions': PrescriptionSerializer(prescriptions, many=True).data,
+        'lab_results': LabTestSerializer(lab_tests, many=True).data,
+    }
+
+
+def _stream_json(queryset, serializer):
+    """Tableau JSON produit ligne par ligne, le queryset étant lu par lots de 200."""
+    # Même encodage que ORJSONRenderer.
+    yield b'['
+    for index, obj in enumerate(queryset.iterator(chunk_size=200)):
+        yield (b',' if index else b'') + dumps(serializer.to_representation(obj))
+    yield b']'
+
+
+def _streaming_list(request, queryset, serializer_class):
+    """Liste en flux JSON ; les autres formats négociés (API navigable) passent par DRF."""
+    context = {'request': request}
+    if not isinstance(request.accepted_renderer, JSONRenderer):
+        return Response(serializer_class(queryset, many=True, context=context).data)
+    return StreamingHttpResponse(
+        _stream_json(queryset, serializer_class(context=context)), content_type='application/json'
+    )
+
+
+# Le DEP sérialisé est mis en cache sous une clé qui inclut un numéro de version
+# par patient : toute écriture dans le DEP incrémente la version, ce qui rend
+# l'ancienne entrée inaccessible (elle expire d'elle-même).
+_DEP_CACHE_TIMEOUT = 3600
+
+
+def _dep_version_key(patient_id):
+    return f"dep_version:{patient_id}"
+
+
+def _dep_version(patient_id):
+    # Version initiale horodatée : si la clé est évincée, elle ne retombe pas
+    # sur une version déjà utilisée par une entrée encore en cache.
+    return cache.get_or_set(_dep_version_key(patient_id), time.time_ns(), None)
+
+
+def _bump_dep_version(patient_id):
+    """Invalide le DEP en cache d'un patient après une écriture."""
+    # Nouvelle version horodatée plutôt que incr() : rien ne peut échouer si
+    # la clé a été évincée entre-temps (l'écriture est déjà validée).
+    cache.set(_dep_version_key(patient_id), time.time_ns(), None)
+
+
+def _cached_dep(patient_id):
+    key = f"dep:{patient_id}:{_dep_version(patient_id)}"
+    return cache.get_or_set(key, lambda: _build_dep(patient_id), _DEP_CACHE_TIMEOUT)
+
+
+def _patient_id(user_id):
+    """Identifiant du patient s'il existe, None sinon."""
+    return User.objects.filter(id=user_id, userRole=User.TypeRole.PATIENT).values_list('id', flat=True).first()
+
+
+def _require_access(patient_id, professional):
+    """Refuse (403) l'écriture dans le DEP sans autorisation active et non expirée."""
+    if not AccessAuthorization.has_active_access(patient_id, professional.id):
+        raise PermissionDenied("Accès au DEP du patient non autorisé ou expiré pour l'écriture.")
+
+
+def _bulk_create_records(request, serializer_class):
+    """Crée en un seul INSERT la liste de notes/ordonnances postée par un médecin.
+
+    Chaque élément porte son champ patient ; existence des patients et accès
+    sont vérifiés en une requête chacun pour toute la liste.
+    """
+    serializer = serializer_class(data=request.data, many=True)
+    serializer.is_valid(raise_exception=True)
+
+    try:
+        patient_ids = [int(item['patient']) for item in request.data]
+    except (KeyError, TypeError, ValueError):
+        # Même réponse que pour un seul objet.
+        return Response({"patient": "Le champ patient est requis."}, status=HTTP_400_BAD_REQUEST)
+    wanted = set(patient_ids)
+
+    found = set(User.objects.filter(
+        id__in=wanted, userRole=User.TypeRole.PATIENT
+    ).values_list('id', flat=True))
+    if found != wanted:
+        raise NotFound("Patient non trouvé.")
+
+    allowed = set(AccessAuthorization.objects.valid().filter(
+        patient_id__in=wanted, professional=request.user
+    ).values_list('patient_id', flat=True))
+    if allowed != wanted:
+        raise PermissionDenied("Accès au DEP du patient non autorisé ou expiré pour l'écriture.")
+
+    model = serializer_class.Meta.model
+    records = model.objects.bulk_create(
+        [
+            model(**data, doctor=request.user, patient_id=patient_id)
+            for data, patient_id in zip(serializer.validated_data, patient_ids)
+        ],
+        batch_size=500,
+    )
+    for patient_id in wanted:
+        _bump_dep_version(patient_id)
+    return Response({'ids': [record.id for record in records]}, status=HTTP_201_CREATED)
+
+
 @extend_schema(
     tags=["Utilisateur"],
     description="Opérations CRUD pour l'utilisateur connecté.",
@@ -68,11 +227,20 @@ class UserViewSet(ModelViewSet):
         return UserSerializer
 
     def get_queryset(self):
+        user = self.request.user
         # Un user normal ne voit que lui-même.
-        if self.request.user.is_staff or self.request.user.is_superuser:
-            return User.objects.all().order_by("-created_at")
+        if user.is_staff or user.is_superuser:
+            queryset = User.objects.all().order_by("-created_at")
+        elif self.kwargs.get(self.lookup_field, str(user.pk)) != str(user.pk):
+            # pk d'un autre utilisateur : 404 sans requête SQL.
+            return User.objects.none()
+        else:
+            queryset = User.objects.filter(id=user.id)
 
-        return User.objects.filter(id=self.request.user.id)
+        # En lecture, on ne charge que les colonnes exposées par UserSerializer.
+        if self.action in ["list", "retrieve"]:
+            queryset = queryset.only(*UserSerializer.Meta.fields)
+        return queryset
 
 
 @extend_schema(
@@ -90,6 +258,12 @@ class AdminUserViewSet(ModelViewSet):
 
         return UserSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ["list", "retrieve"]:
+            queryset = queryset.only(*UserSerializer.Meta.fields)
+        return queryset
+
 
 @extend_schema(
     tags=["Inscription"],
@@ -103,7 +277,7 @@ class PatientRegisterViewSet(GenericViewSet):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        return Response(UserSerializer(user).data, status=HTTP_201_CREATED)
+        return Response(serialize_user(user), status=HTTP_201_CREATED)
 
 
 @extend_schema(
@@ -118,7 +292,7 @@ class MedecinRegisterViewSet(GenericViewSet):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        return Response(UserSerializer(user).data, status=HTTP_201_CREATED)
+        return Response(serialize_user(user), status=HTTP_201_CREATED)
 
 
 @extend_schema(
@@ -133,7 +307,7 @@ class LaboRegisterViewSet(GenericViewSet):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        return Response(UserSerializer(user).data, status=HTTP_201_CREATED)
+        return Response(serialize_user(user), status=HTTP_201_CREATED)
 
 
 @extend_schema(tags=["Patient - Mon DEP"])
@@ -141,53 +315,53 @@ class DEPPatientViewSet(GenericViewSet):
     """Fonctionnalités du Patient (PAT-1, PAT-2, PAT-3)."""
     permission_classes = [IsPatient]
 
-    # /api/dep/patient/consult
-    @action(detail=False, methods=['get'])
+    # /api/dep/patient/consult/
+    @action(detail=False, methods=['get'], url_path='consult', url_name='consult-dep')
     def consult_dep(self, request):
         """PAT-1: Consultation agrégée du DEP."""
         user = request.user
-        
-        notes = ClinicalNoteSerializer(
-            ClinicalNote.objects.filter(patient=user).order_by('-created_at'), many=True
-        ).data
-        prescriptions = PrescriptionSerializer(
-            Prescription.objects.filter(patient=user).order_by('-created_at'), many=True
-        ).data
-        lab_results = LabTestSerializer(
-            LabTest.objects.filter(patient=user, status=LabTest.TestStatus.COMPLETED).order_by('-created_at'), many=True
-        ).data
+        dep = _cached_dep(user.pk)
+        # Le patient ne voit que les examens terminés.
+        dep = {
+            **dep,
+            'lab_results': [
+                result for result in dep['lab_results']
+                if result['status'] == LabTest.TestStatus.COMPLETED
+            ],
+        }
         
         # Vous pouvez ajouter ici l'agrégation des données vitales du PatientProfile
+        # dep['patient_profile'] = PatientProfileSerializer(user.patient_profile).data
         
-        return Response({
-            'clinical_notes': notes,
-            'prescriptions': prescriptions,
-            'lab_results': lab_results,
-            # 'patient_profile': PatientProfileSerializer(user.patient_profile.first()).data 
-        })
+        return Response(dep)
     
     # /api/dep/patient/prescriptions/ (PAT-2)
-    @action(detail=False, methods=['get'], url_path='prescriptions')
+    @action(detail=False, methods=['get'], url_path='prescriptions', url_name='list-prescriptions')
     def list_prescriptions(self, request):
         """PAT-2: Liste des ordonnances."""
-        prescriptions = Prescription.objects.filter(patient=request.user).order_by('-created_at')
-        return Response(PrescriptionSerializer(prescriptions, many=True).data)
+        prescriptions = _with_user_names(
+            Prescription.objects.filter(patient=request.user), 'doctor'
+        ).order_by('-created_at')
+        return _streaming_list(request, prescriptions, PrescriptionSerializer)
 
     # /api/dep/patient/lab-results/ (PAT-3)
-    @action(detail=False, methods=['get'], url_path='lab-results')
+    @action(detail=False, methods=['get'], url_path='lab-results', url_name='list-lab-results')
     def list_lab_results(self, request):
         """PAT-3: Liste des résultats de laboratoire."""
-        lab_results = LabTest.objects.filter(patient=request.user).order_by('-created_at')
-        return Response(LabTestSerializer(lab_results, many=True).data)
+        lab_results = _with_user_names(
+            LabTest.objects.filter(patient=request.user), *_LAB_TEST_USERS
+        ).order_by('-created_at')
+        return _streaming_list(request, lab_results, LabTestSerializer)
 
 
 @extend_schema(tags=["Patient/Médecin - Gestion des Accès"])
 class AccessControlViewSet(GenericViewSet):
     """PAT-4, PAT-5, DOC-2, DOC-3 : Gestion et vérification des autorisations d'accès."""
     permission_classes = [IsAuthenticated]
+    lookup_value_regex = r"\d+"
 
     # /api/dep/access/grant/
-    @action(detail=False, methods=['post'], permission_classes=[IsPatient])
+    @action(detail=False, methods=['post'], permission_classes=[IsPatient], url_path='grant', url_name='grant')
     def grant_access(self, request):
         """PAT-4: Accorder l'accès à un professionnel."""
         serializer = CreateAccessRequestSerializer(data=request.data)
@@ -198,25 +372,32 @@ class AccessControlViewSet(GenericViewSet):
         
         try:
             # Vérifier l'existence et le rôle du professionnel
-            professional = User.objects.get(userMail__iexact=professional_email)
-            if professional.userRole not in [User.TypeRole.MEDECIN, User.TypeRole.LABORATOIRE]:
+            professional = User.objects.only('id', 'userRole', 'userName').get(userMail__iexact=professional_email)
+            if professional.userRole not in _PRO_ROLES:
                 return Response({"detail": "L'e-mail ne correspond pas à un professionnel de santé valide."}, 
                                 status=HTTP_400_BAD_REQUEST)
         except User.DoesNotExist:
             return Response({"detail": "Professionnel non trouvé."}, status=HTTP_404_NOT_FOUND)
 
-        # Créer ou mettre à jour l'autorisation
-        expires_at = timezone.now() + timedelta(days=expiration_days)
-        auth, created = AccessAuthorization.objects.update_or_create(
-            patient=request.user, 
-            professional=professional,
-            defaults={'is_active': True, 'expires_at': expires_at}
+        # Créer ou mettre à jour l'autorisation en une requête (INSERT ... ON CONFLICT DO UPDATE)
+        expires_at = timezone.now() + _expiration_delta(expiration_days)
+        auth = AccessAuthorization(
+            patient=request.user, professional=professional, is_active=True, expires_at=expires_at
+        )
+        AccessAuthorization.objects.bulk_create(
+            [auth],
+            update_conflicts=True,
+            unique_fields=['patient', 'professional'],
+            update_fields=['is_active', 'expires_at'],
         )
+        # Sur un conflit, granted_at et is_emergency restent ceux de la ligne
+        # existante : on les relit pour que la réponse reflète la base.
+        auth.refresh_from_db(fields=['granted_at', 'is_emergency'])
         
         return Response(AccessAuthorizationSerializer(auth).data, status=HTTP_201_CREATED)
 
     # /api/dep/access/{pk}/revoke/
-    @action(detail=True, methods=['post'], permission_classes=[IsPatient])
+    @action(detail=True, methods=['post'], permission_classes=[IsPatient], url_path='revoke', url_name='revoke')
     def revoke_access(self, request, pk=None):
         """PAT-5: Révoquer l'accès à un professionnel (pk est l'ID de l'autorisation)."""
         try:
@@ -229,7 +410,7 @@ class AccessControlViewSet(GenericViewSet):
         return Response({"detail": "Accès révoqué avec succès."}, status=HTTP_200_OK)
 
     # /api/dep/access/check/?patient_id=X (DOC-3 vérification et consultation)
-    @action(detail=False, methods=['get'], permission_classes=[IsDoctor | IsLabo], url_path='check')
+    @action(detail=False, methods=['get'], permission_classes=[IsDoctor | IsLabo], url_path='check', url_name='check-consult')
     def check_access_and_consult(self, request):
         """DOC-3: Vérifie l'accès et retourne le DEP si autorisé."""
         patient_id = request.query_params.get('patient_id')
@@ -237,29 +418,31 @@ class AccessControlViewSet(GenericViewSet):
             return Response({"detail": "patient_id est requis."}, status=HTTP_400_BAD_REQUEST)
 
         try:
-            patient = User.objects.get(id=patient_id, userRole=User.TypeRole.PATIENT)
-        except User.DoesNotExist:
-            return Response({"detail": "Patient non trouvé."}, status=HTTP_404_NOT_FOUND)
-        
-        # Vérification de l'autorisation
-        auth = AccessAuthorization.objects.filter(patient=patient, professional=request.user).first()
-        
-        if auth and auth.is_valid():
-            # Si autorisé, retourner le DEP agrégé (similaire à PAT-1)
-            notes = ClinicalNoteSerializer(ClinicalNote.objects.filter(patient=patient).order_by('-created_at'), many=True).data
-            prescriptions = PrescriptionSerializer(Prescription.objects.filter(patient=patient).order_by('-created_at'), many=True).data
-            lab_results = LabTestSerializer(LabTest.objects.filter(patient=patient).order_by('-created_at'), many=True).data
-            
-            return Response({
-                'patient_name': patient.userName,
-                'access_status': 'Autorisé',
-                'clinical_notes': notes,
-                'prescriptions': prescriptions,
-                'lab_results': lab_results,
-            })
-        else:
+            # Identifiant normalisé : il sert aussi de clé au cache du DEP.
+            patient_id = int(patient_id)
+        except ValueError:
+            return Response({"detail": "patient_id invalide."}, status=HTTP_400_BAD_REQUEST)
+
+        # Patient et autorisation vérifiés en une seule requête (jointure sur le patient).
+        patient_name = AccessAuthorization.objects.valid().filter(
+            patient_id=patient_id,
+            patient__userRole=User.TypeRole.PATIENT,
+            professional=request.user,
+        ).values_list('patient__userName', flat=True).first()
+
+        if patient_name is None:
+            # Refus : distinguer patient inconnu (404) et accès absent ou expiré (403).
+            if _patient_id(patient_id) is None:
+                return Response({"detail": "Patient non trouvé."}, status=HTTP_404_NOT_FOUND)
             return Response({"detail": "Accès non autorisé ou expiré."}, status=HTTP_403_FORBIDDEN)
 
+        # Si autorisé, retourner le DEP agrégé (similaire à PAT-1)
+        return Response({
+            'patient_name': patient_name,
+            'access_status': 'Autorisé',
+            **_cached_dep(patient_id),
+        })
+
 
 @extend_schema(tags=["Médecin - Clinique"])
 class DoctorClinicalViewSet(GenericViewSet): # Changé ModelViewSet en GenericViewSet car il n'est pas basé sur un seul modèle
@@ -281,7 +464,10 @@ class DoctorClinicalViewSet(GenericViewSet): # Changé ModelViewSet en GenericVi
     # /api/dep/doctor/add-note/
     @action(detail=False, methods=['post'], url_path='add-note')
     def add_note(self, request):
-        """DOC-4: Ajout de Notes Cliniques."""
+        """DOC-4: Ajout de Notes Cliniques (une note, ou une liste de notes)."""
+        if isinstance(request.data, list):
+            return _bulk_create_records(request, ClinicalNoteSerializer)
+
         serializer = ClinicalNoteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
@@ -289,105 +475,125 @@ class DoctorClinicalViewSet(GenericViewSet): # Changé ModelViewSet en GenericVi
         if not patient_id:
              return Response({"patient": "Le champ patient est requis."}, status=HTTP_400_BAD_REQUEST)
 
-        try:
-            patient = User.objects.get(id=patient_id, userRole=User.TypeRole.PATIENT)
-        except User.DoesNotExist:
+        # Seul l'identifiant du patient est utile : pas d'instance User construite.
+        patient_id = _patient_id(patient_id)
+        if patient_id is None:
             return Response({"detail": "Patient non trouvé."}, status=HTTP_404_NOT_FOUND)
 
-        auth = AccessAuthorization.objects.filter(patient=patient, professional=request.user, is_active=True).first()
-        if not auth or not auth.is_valid():
-             return Response({"detail": "Accès au DEP du patient non autorisé ou expiré pour l'écriture."}, status=HTTP_403_FORBIDDEN)
+        _require_access(patient_id, request.user)
         
         # Sauvegarde de la note
-        note = serializer.save(doctor=request.user, patient=patient)
+        note = serializer.save(doctor=request.user, patient_id=patient_id)
+        _bump_dep_version(patient_id)
         return Response(ClinicalNoteSerializer(note).data, status=HTTP_201_CREATED)
 
     # /api/dep/doctor/create-prescription/
     @action(detail=False, methods=['post'], url_path='create-prescription')
     def create_prescription(self, request):
-        """DOC-5: Création d'une Ordonnance."""
+        """DOC-5: Création d'une Ordonnance (une ordonnance, ou une liste)."""
+        if isinstance(request.data, list):
+            return _bulk_create_records(request, PrescriptionSerializer)
+
         serializer = PrescriptionSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
         patient_id = request.data.get('patient')
-        try:
-            patient = User.objects.get(id=patient_id, userRole=User.TypeRole.PATIENT)
-        except User.DoesNotExist:
+        patient_id = _patient_id(patient_id)
+        if patient_id is None:
             return Response({"detail": "Patient non trouvé."}, status=HTTP_404_NOT_FOUND)
 
-        auth = AccessAuthorization.objects.filter(patient=patient, professional=request.user, is_active=True).first()
-        if not auth or not auth.is_valid():
-             return Response({"detail": "Accès au DEP du patient non autorisé ou expiré pour l'écriture."}, status=HTTP_403_FORBIDDEN)
+        _require_access(patient_id, request.user)
              
-        prescription = serializer.save(doctor=request.user, patient=patient)
+        prescription = serializer.save(doctor=request.user, patient_id=patient_id)
+        _bump_dep_version(patient_id)
         return Response(PrescriptionSerializer(prescription).data, status=HTTP_201_CREATED)
 
     # /api/dep/doctor/interpret-lab-result/{pk}/
-    @action(detail=True, methods=['patch'], url_path='interpret-lab-result')
+    @extend_schema(responses=LabTestSerializer)
+    @action(detail=False, methods=['patch'], url_path=r'interpret-lab-result/(?P<pk>\d+)', url_name='interpret-lab')
     def interpret_lab_result(self, request, pk=None):
         """DOC-6: Interprétation des Résultats Labo."""
-        lab_test = get_object_or_404(LabTest, pk=pk)
+        # La réponse renvoie l'examen complet ; des utilisateurs liés, seul le nom est chargé.
+        lab_test = get_object_or_404(_with_user_names(LabTest.objects.all(), *_LAB_TEST_USERS), pk=pk)
         
-        auth = AccessAuthorization.objects.filter(patient=lab_test.patient, professional=request.user, is_active=True).first()
-        if not auth or not auth.is_valid():
-             return Response({"detail": "Accès au DEP du patient non autorisé ou expiré pour l'écriture."}, status=HTTP_403_FORBIDDEN)
+        _require_access(lab_test.patient_id, request.user)
 
         serializer = LabTestInterpretationSerializer(lab_test, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save(interpreted_by=request.user)
+        changes = {**serializer.validated_data, 'interpreted_by': request.user}
+        LabTest.objects.filter(pk=lab_test.pk).update(**changes)
+        for field, value in changes.items():
+            setattr(lab_test, field, value)
+        _bump_dep_version(lab_test.patient_id)
         
-        return Response(LabTestSerializer(lab_test).data, status=HTTP_200_OK)
+        return Response(serializer.data, status=HTTP_200_OK)
 
 
 @extend_schema(tags=["Laboratoire"])
-class LabTestViewSet(ModelViewSet):
+class LabTestViewSet(ListModelMixin, GenericViewSet):
     """LAB-1, LAB-2, LAB-3 : Gestion des examens et des résultats."""
     permission_classes = [IsLabo]
     serializer_class = LabTestSerializer
+    lookup_value_regex = r"\d+"
     
     # LAB-1: Consulter Examens Prescrits
     def get_queryset(self):
         # Retourne les examens prescrit par un médecin (ou directement) et ciblant ce labo 
-        return LabTest.objects.filter(
-            Q(performed_by=self.request.user) # Si le labo est explicitement désigné
-            | Q(performed_by__isnull=True) # Pour les cas où le labo peut prendre n'importe quel test
+        return _with_user_names(
+            LabTest.objects.filter(_lab_editable(self.request.user)), *_LAB_TEST_USERS
         ).order_by('-created_at')
 
     # /api/dep/labo/examens/{pk}/set-status/
     @action(detail=True, methods=['patch'], url_path='set-status')
     def set_status(self, request, pk=None):
         """LAB-2: Modifier Statut Examen."""
-        lab_test = get_object_or_404(LabTest, pk=pk)
-        
-        if lab_test.performed_by and lab_test.performed_by != request.user:
-             return Response({"detail": "Vous n'êtes pas autorisé à modifier cet examen."}, status=HTTP_403_FORBIDDEN)
+        serializer = LabTestStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        new_status = request.data.get('status')
-        if new_status not in [choice[0] for choice in LabTest.TestStatus.choices]:
-             return Response({"status": "Statut invalide."}, status=HTTP_400_BAD_REQUEST)
-        
-        lab_test.status = new_status
-        lab_test.save()
+        # UPDATE direct, restreint aux examens modifiables par ce labo.
+        updated = LabTest.objects.filter(pk=pk).filter(_lab_editable(request.user)).update(
+            status=serializer.validated_data['status']
+        )
+        if not updated:
+            # Aucune ligne : examen inexistant (404) ou attribué à un autre labo (403).
+            if not LabTest.objects.filter(pk=pk).exists():
+                raise Http404
+            return Response({"detail": "Vous n'êtes pas autorisé à modifier cet examen."}, status=HTTP_403_FORBIDDEN)
+
+        lab_test = _with_user_names(LabTest.objects.filter(pk=pk), *_LAB_TEST_USERS).get()
+        _bump_dep_version(lab_test.patient_id)
         return Response(LabTestSerializer(lab_test).data, status=HTTP_200_OK)
 
     # /api/dep/labo/examens/{pk}/upload-result/
+    @extend_schema(request=LabTestResultUploadSerializer, responses=LabTestSerializer)
     @action(detail=True, methods=['post'], parser_classes=[FileUploadParser], url_path='upload-result')
     def upload_result(self, request, pk=None):
         """LAB-3: Dépôt des Résultats."""
-        lab_test = get_object_or_404(LabTest, pk=pk)
+        lab_test = get_object_or_404(_with_user_names(LabTest.objects.all(), *_LAB_TEST_USERS), pk=pk)
         
-        if lab_test.performed_by and lab_test.performed_by != request.user:
+        if lab_test.performed_by_id and lab_test.performed_by_id != request.user.id:
              return Response({"detail": "Vous n'êtes pas autorisé à modifier cet examen."}, status=HTTP_403_FORBIDDEN)
 
         serializer = LabTestResultUploadSerializer(lab_test, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        
-        lab_test = serializer.save(
-            result_uploaded_at=timezone.now(),
-            status=LabTest.TestStatus.COMPLETED, 
-            performed_by=request.user 
-        )
-        return Response(LabTestSerializer(lab_test).data, status=HTTP_200_OK)
+
+        # Le fichier est écrit dans le stockage, puis seules les colonnes
+        # modifiées sont mises à jour (pas de save() de toute la ligne).
+        changes = {
+            'result_uploaded_at': timezone.now(),
+            'status': LabTest.TestStatus.COMPLETED,
+            'performed_by': request.user,
+        }
+        document = serializer.validated_data.get('result_document')
+        if document:
+            lab_test.result_document.save(document.name, document, save=False)
+            changes['result_document'] = lab_test.result_document.name
+        LabTest.objects.filter(pk=lab_test.pk).update(**changes)
+        for field, value in changes.items():
+            if field != 'result_document':
+                setattr(lab_test, field, value)
+        _bump_dep_version(lab_test.patient_id)
+        return Response(serializer.data, status=HTTP_200_OK)
 
 
 @extend_schema(tags=["Administrateur - Gestion"])
@@ -396,30 +602,32 @@ class AdminControlViewSet(GenericViewSet):
     permission_classes = [IsAdminUser]
 
     # /api/admin/pending-pros/ (ADM-1)
-    @action(detail=False, methods=['get'], url_path='pending-pros')
+    @action(detail=False, methods=['get'], url_path='pending-pros', url_name='pending-pros')
     def list_pending_professionals(self, request):
         """ADM-1: Récupération de la liste des comptes en attente de validation."""
         
-        pending_users = User.objects.filter(
-            Q(userRole=User.TypeRole.MEDECIN) | Q(userRole=User.TypeRole.LABORATOIRE)
-        ).filter(is_active=False).order_by('created_at')
+        pending_users = User.objects.filter(_PRO_Q, is_active=False).order_by(
+            'created_at'
+        ).only(*UserSerializer.Meta.fields)
 
-        return Response(UserSerializer(pending_users, many=True).data)
+        page = self.paginate_queryset(pending_users)
+        return self.get_paginated_response(UserSerializer(page, many=True).data)
 
-    # /api/admin/validate-pro/{pk}/ (ADM-1)
-    @action(detail=True, methods=['patch'])
+    # /api/admin/pros/{pk}/validate/ (ADM-1)
+    @action(detail=False, methods=['patch'], url_path=r'pros/(?P<pk>\d+)/validate', url_name='validate-pro')
     def validate_professional(self, request, pk=None):
         """ADM-1: Validation d'un compte professionnel (met is_active à True)."""
         user = get_object_or_404(User, pk=pk)
-        if user.userRole in [User.TypeRole.MEDECIN, User.TypeRole.LABORATOIRE] and not user.is_active:
+        if user.userRole in _PRO_ROLES and not user.is_active:
             user.is_active = True
             user.save()
-            return Response(UserSerializer(user).data, status=HTTP_200_OK)
+            return Response(serialize_user(user), status=HTTP_200_OK)
         return Response({"detail": "Utilisateur non trouvé ou déjà validé."}, status=HTTP_400_BAD_REQUEST)
 
     # /api/admin/logs/ (ADM-5)
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], url_path='logs', pagination_class=AuditLogPagination)
     def audit_logs(self, request):
         """ADM-5: Récupération des journaux d'audit."""
-        logs = AuditLog.objects.all().order_by('-timestamp')
-        return Response(AuditLogSerializer(logs, many=True).data)
\ No newline at end of file
+        logs = AuditLogSerializer.rows(AuditLog.objects.order_by('-timestamp'))
+        page = self.paginate_queryset(logs)
+        return self.get_paginated_response(AuditLogSerializer(page, many=True).data)
\ No newline at end of file